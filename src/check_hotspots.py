@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from hotspots import encode_cells, decode_cells, parent_cells
+from hotspots import hotspot_grid, rollup_grid, query_bbox
+# QUICK CHECKS FOR hotspots.py, run with: python check_hotspots.py
+
+# random points over the US with some NaN measures, seeded so runs match
+def make_points(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "ID": np.arange(n),
+        "State": rng.choice(["Ohio", "Texas", "Utah"], n),
+        "County": rng.choice(["A", "B"], n),
+        "Start_Lat": rng.uniform(24, 50, n),
+        "Start_Lng": rng.uniform(-125, -66, n),
+        "Severity": rng.integers(1, 5, n).astype(float),
+        "Distance(mi)": rng.exponential(1.0, n),
+    })
+    df.loc[rng.random(n) < 0.3, "Severity"] = np.nan
+    return df
+
+def check_round_trip(df):
+    # the center of a point's cell must encode back to the same cell,
+    # and be within half a cell of the point
+    level = 14
+    cells = encode_cells(df["Start_Lat"].values, df["Start_Lng"].values, level)
+    lat, lng = decode_cells(cells, level)
+    assert np.array_equal(encode_cells(lat, lng, level), cells)
+    assert np.all(np.abs(lat - df["Start_Lat"].values) <= 180.0 / (1 << level) / 2)
+    assert np.all(np.abs(lng - df["Start_Lng"].values) <= 360.0 / (1 << level) / 2)
+
+def check_parent_is_shift(df):
+    fine = encode_cells(df["Start_Lat"].values, df["Start_Lng"].values, 14)
+    for coarse in (0, 5, 13, 14):
+        direct = encode_cells(df["Start_Lat"].values, df["Start_Lng"].values, coarse)
+        assert np.array_equal(parent_cells(fine, 14, coarse), direct)
+
+def check_rollup_matches_direct(df):
+    agg_dict = {"ID": "count", "Severity": "mean", "Distance(mi)": "sum"}
+    for group_cols in (None, ["State", "County"]):
+        keys = (group_cols or []) + ["Cell"]
+        rolled = rollup_grid(hotspot_grid(df, agg_dict, 12, group_cols), agg_dict, 6, group_cols)
+        direct = hotspot_grid(df, agg_dict, 6, group_cols)
+        rolled = rolled.sort_values(keys).reset_index(drop=True)
+        direct = direct.sort_values(keys).reset_index(drop=True)
+        pd.testing.assert_frame_equal(rolled, direct)
+
+def check_bbox_edges():
+    # level 4 cells are 11.25 deg tall and 22.5 deg wide
+    df = pd.DataFrame({"ID": [0, 1, 2], "Start_Lat": [1.0, 12.0, -1.0], "Start_Lng": [1.0, 1.0, 1.0]})
+    grid = hotspot_grid(df, {"ID": "count"}, 4)
+    # a tiny box inside the first cell still returns that whole cell
+    assert query_bbox(grid, 0.5, 0.5, 0.6, 0.6)["Total_Accidents"].tolist() == [1]
+    # a box touching the cell edge at 11.25 picks up the cell above too
+    assert sorted(query_bbox(grid, 0.5, 0.5, 11.25, 0.6)["Lat"].round(3).tolist()) == [5.625, 16.875]
+    try:
+        query_bbox(grid, 2.0, 0.0, 1.0, 1.0)
+        raise AssertionError("inverted box should raise")
+    except ValueError:
+        pass
+
+def check_bad_rows_dropped():
+    df = pd.DataFrame({
+        "ID": [0, 1, 2, 3],
+        "State": ["Ohio", "Ohio", None, "Ohio"],
+        "County": ["A", "A", "A", "A"],
+        "Start_Lat": [40.0, np.nan, 40.0, "bad"],
+        "Start_Lng": [-80.0, -80.0, -80.0, -80.0],
+    })
+    grid = hotspot_grid(df, {"ID": "count"}, 10, ["State", "County"])
+    assert grid["Total_Accidents"].tolist() == [1]
+
+def main():
+    df = make_points()
+    check_round_trip(df)
+    check_parent_is_shift(df)
+    check_rollup_matches_direct(df)
+    check_bbox_edges()
+    check_bad_rows_dropped()
+    print("All hotspot checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+# ALL POINT LEVEL (Start_Lat / Start_Lng) HOTSPOT GRIDDING IN HERE
+
+# finest level we allow, 2 bits per level so cell ids fit in 48 bits
+# (leaves the top 16 bits of the key free for the State/County code)
+MAX_LEVEL = 24
+# level 14 cells are about 1.2km tall, small enough to tell corridors apart
+DEFAULT_LEVEL = 14
+GROUP_SHIFT = np.uint64(2 * MAX_LEVEL)
+CELL_MASK = np.uint64((1 << (2 * MAX_LEVEL)) - 1)
+
+# spreads the low 32 bits of v out so there is a 0 between every bit
+def _spread_bits(v):
+    v = v.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+# undoes _spread_bits
+def _compact_bits(v):
+    v = v.astype(np.uint64) & np.uint64(0x5555555555555555)
+    v = (v | (v >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    v = (v | (v >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return v
+
+def _check_level(level):
+    if not 0 <= level <= MAX_LEVEL:
+        raise ValueError(f"level must be between 0 and {MAX_LEVEL}, got {level}")
+
+# turns lat/lng into integer row/column of the grid at this level
+def _to_xy(lat, lng, level):
+    side = 1 << level
+    x = np.floor((np.asarray(lng, dtype=float) + 180.0) / 360.0 * side)
+    y = np.floor((np.asarray(lat, dtype=float) + 90.0) / 180.0 * side)
+    # points right on the east/north edge go in the last cell
+    x = np.clip(x, 0, side - 1).astype(np.uint64)
+    y = np.clip(y, 0, side - 1).astype(np.uint64)
+    return x, y
+
+# gets the quadtree (z-order) cell id for every point
+def encode_cells(lat, lng, level=DEFAULT_LEVEL):
+    """
+    Bin lat/lng points into a quadtree grid and return one uint64 cell id per point.
+    The id interleaves the column and row bits, so a cell's parent is just
+    the id shifted right by 2 bits per level.
+    """
+    _check_level(level)
+    x, y = _to_xy(lat, lng, level)
+    return _spread_bits(x) | (_spread_bits(y) << np.uint64(1))
+
+# gets the center lat/lng of each cell id
+def decode_cells(cells, level=DEFAULT_LEVEL):
+    _check_level(level)
+    cells = np.asarray(cells, dtype=np.uint64) & CELL_MASK
+    side = 1 << level
+    x = _compact_bits(cells).astype(float)
+    y = _compact_bits(cells >> np.uint64(1)).astype(float)
+    lng = (x + 0.5) / side * 360.0 - 180.0
+    lat = (y + 0.5) / side * 180.0 - 90.0
+    return lat, lng
+
+# gets the parent cell ids at a coarser level
+def parent_cells(cells, level, coarser_level):
+    _check_level(coarser_level)
+    if coarser_level > level:
+        raise ValueError(f"coarser_level ({coarser_level}) must not be finer than level ({level})")
+    return np.asarray(cells, dtype=np.uint64) >> np.uint64(2 * (level - coarser_level))
+
+# sums/means every measure per key with bincount, no python loop over rows
+def _reduce(keys, counts, measures):
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.ravel()
+    out = {"Total_Accidents": np.bincount(inverse, weights=counts, minlength=len(uniq)).astype(np.int64)}
+    for col, (values, how, weights) in measures.items():
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+        if how == "count":
+            out[col] = np.bincount(inverse, weights=np.where(valid, values, 0.0), minlength=len(uniq)).astype(np.int64)
+        elif how == "sum":
+            out[col] = np.bincount(inverse, weights=np.where(valid, values, 0.0), minlength=len(uniq))
+        else:
+            # weights are the number of non NaN values behind each value, kept in
+            # "<col>_n" so rolling up already averaged cells gives the same mean
+            w = np.where(valid, weights, 0.0)
+            total = np.bincount(inverse, weights=np.where(valid, values, 0.0) * w, minlength=len(uniq))
+            n = np.bincount(inverse, weights=w, minlength=len(uniq))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[col] = total / n
+            out[f"{col}_n"] = n.astype(np.int64)
+    return uniq, out
+
+def _check_agg_dict(agg_dict):
+    for col, how in agg_dict.items():
+        if how not in ("count", "sum", "mean"):
+            raise ValueError(f"unsupported aggregation '{how}' for column '{col}' (use count, sum or mean)")
+
+# builds the final grid data frame from the reduced keys
+def _make_grid(uniq, out, level, groups, group_cols):
+    cells = uniq & CELL_MASK
+    lat, lng = decode_cells(cells, level)
+    grid = {}
+    if groups is not None:
+        codes = (uniq >> GROUP_SHIFT).astype(np.int64)
+        for i, name in enumerate(group_cols):
+            grid[name] = groups.get_level_values(i).values[codes]
+    grid["Cell"] = cells
+    grid["Level"] = np.full(len(cells), level, dtype=np.int8)
+    grid["Lat"] = lat
+    grid["Lng"] = lng
+    grid.update(out)
+    return pd.DataFrame(grid)
+
+# packs the State/County (or any group) code into the high bits of the cell id
+def _group_keys(df, cells, group_cols):
+    if not group_cols:
+        return cells, None
+    # a missing State/County can come back as code -1 (depends on pandas version),
+    # which would not decode back to a group
+    if df[group_cols].isna().values.any():
+        raise ValueError(f"missing values in {group_cols}, drop those rows first")
+    codes, groups = pd.MultiIndex.from_frame(df[group_cols]).factorize()
+    if len(groups) >= 1 << 16:
+        raise ValueError(f"too many groups for {group_cols}: {len(groups)}")
+    return (codes.astype(np.uint64) << GROUP_SHIFT) | cells, groups
+
+# returns a df with one row per grid cell (per group if group_cols is given)
+def hotspot_grid(df, agg_dict, level=DEFAULT_LEVEL, group_cols=None):
+    """
+    Bin every accident by Start_Lat/Start_Lng into quadtree cells and aggregate
+    agg_dict per cell. Always adds "Total_Accidents" (the "ID" count, same name
+    clean() in main.py uses), and "<col>_n" (non NaN rows) for every mean. Only
+    count, sum and mean are supported so cells can be rolled up to coarser
+    levels later with rollup_grid.
+    """
+    _check_agg_dict(agg_dict)
+    # remove rows if the location (or group) is missing or not a number,
+    # otherwise they would all land in a made up cell in the corner of the grid
+    lat = pd.to_numeric(df["Start_Lat"], errors="coerce")
+    lng = pd.to_numeric(df["Start_Lng"], errors="coerce")
+    keep = np.isfinite(lat.values) & np.isfinite(lng.values)
+    if group_cols:
+        keep &= df[group_cols].notna().all(axis=1).values
+    df = df.loc[keep]
+
+    cells = encode_cells(lat.values[keep], lng.values[keep], level)
+    keys, groups = _group_keys(df, cells, group_cols)
+
+    ones = np.ones(len(df))
+    measures = {}
+    for col, how in agg_dict.items():
+        if col == "ID":
+            continue
+        values = df[col].notna().values.astype(float) if how == "count" else pd.to_numeric(df[col], errors="coerce").values
+        measures[col] = (values, how, ones)
+
+    uniq, out = _reduce(keys, ones, measures)
+    return _make_grid(uniq, out, level, groups, group_cols)
+
+# merges cells of a hotspot_grid up to a coarser level
+def rollup_grid(grid, agg_dict, coarser_level, group_cols=None):
+    _check_agg_dict(agg_dict)
+    level = int(grid["Level"].iloc[0]) if len(grid) > 0 else coarser_level
+    cells = parent_cells(grid["Cell"].values, level, coarser_level)
+    keys, groups = _group_keys(grid, cells, group_cols)
+
+    counts = grid["Total_Accidents"].values.astype(float)
+    measures = {}
+    for col, how in agg_dict.items():
+        if col == "ID":
+            continue
+        # counts and sums just add up, means get weighted by their non NaN rows
+        weights = grid[f"{col}_n"].values.astype(float) if how == "mean" else counts
+        measures[col] = (grid[col].values, "sum" if how == "count" else how, weights)
+
+    uniq, out = _reduce(keys, counts, measures)
+    for col, how in agg_dict.items():
+        if how == "count" and col in out:
+            out[col] = out[col].astype(np.int64)
+    return _make_grid(uniq, out, coarser_level, groups, group_cols)
+
+# keeps only cells that overlap the box
+def query_bbox(grid, min_lat, min_lng, max_lat, max_lng):
+    """
+    Return every cell of a grid that overlaps the bounding box, including the
+    partly covered cells on its edges. Works on the integer row/column of each
+    cell so it is one vectorized compare, not a loop.
+    """
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValueError(f"empty bounding box: lat {min_lat} to {max_lat}, lng {min_lng} to {max_lng}")
+    if len(grid) == 0:
+        return grid
+    level = int(grid["Level"].iloc[0])
+    cells = grid["Cell"].values.astype(np.uint64)
+    x = _compact_bits(cells)
+    y = _compact_bits(cells >> np.uint64(1))
+    x_lo, y_lo = _to_xy(min_lat, min_lng, level)
+    x_hi, y_hi = _to_xy(max_lat, max_lng, level)
+    mask = (x >= x_lo) & (x <= x_hi) & (y >= y_lo) & (y <= y_hi)
+    return grid[mask]
+
+# returns the top_n cells of every county by number of accidents
+def rank_county_hotspots(df, agg_dict, level=DEFAULT_LEVEL, top_n=5, group_cols=None):
+    if group_cols is None:
+        group_cols = ["State", "County"]
+    grid = hotspot_grid(df, agg_dict, level, group_cols)
+    grid = grid.sort_values(group_cols + ["Total_Accidents"], ascending=[True] * len(group_cols) + [False])
+    grid = grid.groupby(group_cols, sort=False).head(top_n).reset_index(drop=True)
+    grid["Rank"] = grid.groupby(group_cols, sort=False).cumcount() + 1
+    return grid
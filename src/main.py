@@ -13,6 +13,7 @@ from dataCleaning import get_csv
 from dataCleaning import do_traffic_data
 from dataCleaning import do_driver_data
 from dataCleaning import do_cars_data
+from hotspots import rank_county_hotspots
 
 def train(nEsimator, randomState, nJobs, xTrain, yTrain, xTest, yTest):
     rf = RandomForestRegressor(n_estimators=nEsimator, random_state=randomState, n_jobs=nJobs)
@@ -399,6 +400,17 @@ def main():
     bottom_risk = county_df.sort_values("Accidents_Per_1000", ascending=True).head(top_n)
     print(bottom_risk[["State", "County", "Total_Accidents", "Total_People_16_plus", "Accidents_Per_1000", "risk_score"]])
     
+    # ============================================================
+    # Hotspot cells inside the top counties
+    # ============================================================
+    print("\n=== Top 5 Hotspot Cells in the Top 5 High-Risk Counties ===")
+    hotspots = rank_county_hotspots(df, agg_dict, top_n=5)
+    # keeps the risk order of top_risk (a merge would sort by State/County)
+    top_keys = pd.MultiIndex.from_frame(top_risk[["State", "County"]].drop_duplicates().head(5))
+    hotspots["Risk_Order"] = top_keys.get_indexer(pd.MultiIndex.from_frame(hotspots[["State", "County"]]))
+    hotspots = hotspots[hotspots["Risk_Order"] >= 0].sort_values(["Risk_Order", "Rank"])
+    print(hotspots[["State", "County", "Rank", "Lat", "Lng", "Total_Accidents", "Severity"]])
+    
     # ============================================================
     # Plot US bubble maps
     # ============================================================